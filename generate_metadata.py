@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
-"""Generate metadata.json template for all images in the media folder."""
+"""Generate or update metadata.json and resized variants for all images in the media folder."""
 
-import json
+import os
 from pathlib import Path
 
+import orjson
+
+from imaging import encode_jpeg, is_supported_image, variant_key
+
 MEDIA_FOLDER = Path("media")
-SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+VARIANTS_FOLDER = MEDIA_FOLDER / "variants"
 
 # Common DCS World aircraft that might appear in screenshots
 AIRCRAFT_OPTIONS = [
@@ -29,18 +33,62 @@ TAG_OPTIONS = [
     "external", "weapon", "refueling", "carrier-ops", "ground-attack"
 ]
 
+# Popular (width, height) sizes pre-rendered for the /random endpoint.
+# None keeps the aspect ratio, as when that query parameter is omitted.
+VARIANTS = [(200, 200), (800, None), (1280, None), (1920, 1080)]
+
+
+def generate_variants(image_name):
+    """Render every size in VARIANTS for one image, returning key -> path relative to the media folder.
+
+    Variants newer than their source image are left as they are. Sizes that
+    fail to render are left out of the result.
+    """
+    source_path = MEDIA_FOLDER / image_name
+    source_mtime = source_path.stat().st_mtime_ns
+    variants = {}
+
+    for width, height in VARIANTS:
+        key = variant_key(width, height)
+        output_path = VARIANTS_FOLDER / f"{image_name}__{key}.jpg"
+
+        if not output_path.exists() or output_path.stat().st_mtime_ns < source_mtime:
+            # Same pipeline as the API's on-the-fly resize
+            try:
+                payload = encode_jpeg(source_path, width, height)
+            except (OSError, ValueError) as e:
+                # Unreadable image or a size that rounds to 0 px; the API
+                # falls back to resizing on the fly for this size
+                print(f"Warning: Could not render {key} variant of {image_name}: {e}")
+                continue
+            output_path.write_bytes(payload)
+
+        variants[key] = output_path.relative_to(MEDIA_FOLDER).as_posix()
+
+    return variants
+
+
 def generate_metadata():
-    """Generate metadata template for all images."""
+    """Generate or update metadata for all images.
+
+    Existing entries in metadata.json keep their hand-written fields; new
+    images get an empty template, and every image's variants are refreshed.
+    """
 
     # Get all image files
-    image_files = sorted([
-        f.name for f in MEDIA_FOLDER.iterdir()
-        if f.is_file() and f.suffix.lower() in SUPPORTED_FORMATS
-    ])
+    with os.scandir(MEDIA_FOLDER) as it:
+        image_files = sorted(
+            e.name for e in it
+            if e.is_file(follow_symlinks=False) and is_supported_image(e.name)
+        )
+
+    output_path = MEDIA_FOLDER / "metadata.json"
+    existing = orjson.loads(output_path.read_bytes()) if output_path.exists() else {}
 
-    # Create metadata structure
+    # Create metadata structure, keeping anything already in the file
     metadata = {
-        "schema": {
+        **existing,
+        "schema": existing.get("schema") or {
             "description": "Available values for each metadata field",
             "aircraft": AIRCRAFT_OPTIONS,
             "location": LOCATION_OPTIONS,
@@ -48,26 +96,36 @@ def generate_metadata():
             "weather": WEATHER_OPTIONS,
             "tags": TAG_OPTIONS
         },
-        "images": {}
+        "images": dict(existing.get("images", {}))
     }
 
-    # Add empty template for each image
+    VARIANTS_FOLDER.mkdir(exist_ok=True)
+
+    # Add empty template for new images and pre-rendered variants for all
+    new_images = 0
     for image_name in image_files:
-        metadata["images"][image_name] = {
-            "aircraft": [],
-            "location": "",
-            "time_of_day": "",
-            "weather": "",
-            "tags": []
-        }
-
-    # Write to file
-    output_path = MEDIA_FOLDER / "metadata.json"
-    with open(output_path, "w") as f:
-        json.dump(metadata, f, indent=2)
+        image_meta = metadata["images"].get(image_name)
+        if image_meta is None:
+            image_meta = {
+                "aircraft": [],
+                "location": "",
+                "time_of_day": "",
+                "weather": "",
+                "tags": []
+            }
+            new_images += 1
+
+        metadata["images"][image_name] = {**image_meta, "variants": generate_variants(image_name)}
+
+    # Write to a temp file and swap it in, so the running API never reads a
+    # truncated or half-written metadata.json
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    tmp_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    os.replace(tmp_path, output_path)
 
-    print(f"Generated metadata template for {len(image_files)} images")
+    print(f"Updated metadata for {len(image_files)} images ({new_images} new)")
     print(f"Output: {output_path}")
+    print(f"Variants: {VARIANTS_FOLDER} ({len(VARIANTS)} sizes per image)")
     print(f"\nNext steps:")
     print(f"1. Edit {output_path} to add tags to your images")
     print(f"2. You can add multiple aircraft to the 'aircraft' array")
@@ -0,0 +1,75 @@
+"""Image helpers shared by the API and generate_metadata.py."""
+
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PIL import Image
+
+SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+
+# Lower- and upper-case suffixes, so str.endswith() handles the common cases
+# without allocating a lowered copy of every file name
+_EXT_TUPLE = tuple(sorted(SUPPORTED_FORMATS)) + tuple(sorted(ext.upper() for ext in SUPPORTED_FORMATS))
+
+
+def is_supported_image(name: str) -> bool:
+    """Check whether a file name has one of the supported image extensions."""
+    return name.endswith(_EXT_TUPLE) or name.lower().endswith(_EXT_TUPLE)
+
+
+def target_size(size: Tuple[int, int], width: Optional[int], height: Optional[int]) -> Tuple[int, int]:
+    """Compute output dimensions, maintaining aspect ratio if only one dimension is provided."""
+    original_width, original_height = size
+
+    if width and height:
+        return width, height
+    elif width:
+        aspect_ratio = original_height / original_width
+        return width, int(width * aspect_ratio)
+    else:
+        aspect_ratio = original_width / original_height
+        return int(height * aspect_ratio), height
+
+
+def resize_image(image: Image.Image, width: Optional[int], height: Optional[int]) -> Image.Image:
+    """Resize image to specified dimensions while maintaining aspect ratio if only one dimension is provided."""
+    if width is None and height is None:
+        return image
+
+    size = target_size(image.size, width, height)
+    if size[0] < 1 or size[1] < 1:
+        raise ValueError(f"Target size {size[0]}x{size[1]} rounds to 0 px")
+
+    # For downscales, shrink with a fast box reduce first and run LANCZOS on
+    # the smaller intermediate; output size is unchanged
+    if size[0] < image.width and size[1] < image.height:
+        return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
+def encode_jpeg(path: Path, width: Optional[int], height: Optional[int]) -> bytes:
+    """Decode, optionally resize and re-encode an image as JPEG bytes."""
+    with Image.open(path) as img:
+        if width or height:
+            width, height = target_size(img.size, width, height)
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when the target is
+            # small enough, keeping 2x headroom for the final LANCZOS pass.
+            # No-op for non-JPEG sources.
+            img.draft("RGB", (max(width, 1) * 2, max(height, 1) * 2))
+
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGB")
+
+        if width or height:
+            img = resize_image(img, width, height)
+
+        img_byte_arr = BytesIO()
+        img.save(img_byte_arr, format="JPEG", quality=85)
+        return img_byte_arr.getvalue()
+
+
+def variant_key(width: Optional[int], height: Optional[int]) -> str:
+    """Return the metadata key for a pre-rendered size, e.g. '800x' or '200x200'."""
+    return f"{width or ''}x{height or ''}"
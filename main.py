@@ -1,94 +1,320 @@
+import asyncio
 import os
 import random
-import json
+import threading
+import time
 from pathlib import Path
-from io import BytesIO
-from typing import Optional, List, Dict, Any
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Tuple, Set, FrozenSet
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from PIL import Image
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import FileResponse, ORJSONResponse
+from PIL import features
 
-app = FastAPI(title="Random Screenshot API", version="1.0.0")
+from imaging import encode_jpeg, is_supported_image, variant_key
+
+app = FastAPI(
+    title="Random Screenshot API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 MEDIA_FOLDER = Path("media")
-SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+
+# Formats returned unmodified when no resize is requested
+PASSTHROUGH_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+
 METADATA_FILE = MEDIA_FOLDER / "metadata.json"
 AVATARS_FOLDER = MEDIA_FOLDER / "avatars"
 
-# Global metadata cache
-_metadata_cache: Optional[Dict[str, Any]] = None
+# JPEG encode/decode dominates request time; make deploys without the
+# SIMD-accelerated codec visible in the logs.
+if not features.check_feature("libjpeg_turbo"):
+    print("Warning: Pillow is not built against libjpeg-turbo; JPEG encoding will be slower")
+
+# Pillow decode/resize/encode runs here so it doesn't block the event loop;
+# Pillow releases the GIL in those paths, so jobs run in parallel.
+_pil_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Rendered JPEG bytes keyed by (path, mtime_ns, width, height), bounded by
+# total size; single renders above the entry limit are never cached
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RENDER_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+_render_cache: "OrderedDict[Tuple[Path, int, Optional[int], Optional[int]], bytes]" = OrderedDict()
+_render_cache_bytes = 0
+_render_cache_lock = threading.Lock()
+
+# Module-level generator for image selection on the request path
+_rng = random.Random()
+
+# Fields with inverted indexes (field -> value -> image names)
+INDEXED_FIELDS = ("aircraft", "location", "time_of_day", "weather", "tags")
+_NO_MATCHES: FrozenSet[str] = frozenset()
+
+# Cached media folder listing, rebuilt when the folder's mtime changes
+_image_index: Tuple[Tuple[str, Path], ...] = ()
+_image_paths: Dict[str, Path] = {}
+_index_mtime: Optional[int] = None
+
+# The media folder is checked once at startup; only /health re-checks it,
+# at most every MEDIA_CHECK_TTL seconds
+MEDIA_CHECK_TTL = 30.0
+_media_ok = MEDIA_FOLDER.exists()
+_media_check: Tuple[float, bool] = (time.monotonic(), _media_ok)
+
+if not _media_ok:
+    print(f"Warning: Media folder not found: {MEDIA_FOLDER}")
+
+
+def _build_indexes(images_metadata: Dict[str, Any]) -> Dict[str, Dict[str, Set[str]]]:
+    """Build value -> image names lookups for every filterable metadata field."""
+    indexes: Dict[str, Dict[str, Set[str]]] = {field: defaultdict(set) for field in INDEXED_FIELDS}
+
+    for image_name, image_meta in images_metadata.items():
+        for aircraft in image_meta.get("aircraft", []):
+            indexes["aircraft"][aircraft].add(image_name)
+
+        for field in ("location", "time_of_day", "weather"):
+            value = image_meta.get(field)
+            if value:
+                indexes[field][value].add(image_name)
+
+        for tag in image_meta.get("tags", []):
+            indexes["tags"][tag].add(image_name)
+
+    return indexes
+
+
+def _build_stats(images_metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Count images with each metadata value for the /tags endpoint."""
+    aircraft_counts: Counter = Counter()
+    location_counts: Counter = Counter()
+    time_of_day_counts: Counter = Counter()
+    weather_counts: Counter = Counter()
+    tag_counts: Counter = Counter()
+
+    # Count occurrences
+    for image_meta in images_metadata.values():
+        aircraft_counts.update(image_meta.get("aircraft", ()))
+        tag_counts.update(image_meta.get("tags", ()))
+
+        if location := image_meta.get("location"):
+            location_counts[location] += 1
+        if time_of_day := image_meta.get("time_of_day"):
+            time_of_day_counts[time_of_day] += 1
+        if weather := image_meta.get("weather"):
+            weather_counts[weather] += 1
+
+    return {
+        "tagged_images": len(images_metadata),
+        "aircraft_counts": dict(aircraft_counts),
+        "location_counts": dict(location_counts),
+        "time_of_day_counts": dict(time_of_day_counts),
+        "weather_counts": dict(weather_counts),
+        "tag_counts": dict(tag_counts)
+    }
 
 
-def load_metadata() -> Dict[str, Any]:
-    """Load metadata from JSON file. Uses cache if available."""
-    global _metadata_cache
+def _build_variants(images_metadata: Dict[str, Any]) -> Dict[str, Dict[str, Path]]:
+    """Resolve each image's pre-rendered variants to paths, keeping only up-to-date files.
 
-    if _metadata_cache is not None:
-        return _metadata_cache
+    A variant counts as up to date if it is at least as new as its source
+    image. This is checked once per metadata load, not per request.
+    """
+    variants: Dict[str, Dict[str, Path]] = {}
 
-    if not METADATA_FILE.exists():
-        return {"schema": {}, "images": {}}
+    for image_name, image_meta in images_metadata.items():
+        declared = image_meta.get("variants")
+        if not declared:
+            continue
+
+        try:
+            source_mtime = os.stat(MEDIA_FOLDER / image_name).st_mtime_ns
+        except FileNotFoundError:
+            continue
+
+        fresh = {}
+        for key, variant in declared.items():
+            variant_path = MEDIA_FOLDER / variant
+            try:
+                if variant_path.stat().st_mtime_ns >= source_mtime:
+                    fresh[key] = variant_path
+            except FileNotFoundError:
+                pass
+
+        if fresh:
+            variants[image_name] = fresh
+
+    return variants
+
+
+def _empty_meta_state() -> Dict[str, Any]:
+    """Return the metadata state used when metadata.json is missing or invalid."""
+    return {
+        "mtime": None,
+        "data": {"schema": {}, "images": {}},
+        "indexes": {},
+        "stats": _build_stats({}),
+        "variants": {}
+    }
+
+
+# Global metadata cache, reloaded when metadata.json's mtime changes. The
+# whole state dict is replaced on reload, so readers take a reference
+# without locking and always see data, indexes, stats and variants from the
+# same file.
+_meta_state: Dict[str, Any] = _empty_meta_state()
+_meta_lock = threading.Lock()
+
+
+def _load_meta_state() -> Dict[str, Any]:
+    """Return the current metadata state, reloading metadata.json if it changed."""
+    global _meta_state
 
     try:
-        with open(METADATA_FILE, "r") as f:
-            _metadata_cache = json.load(f)
-            return _metadata_cache
-    except Exception as e:
-        print(f"Warning: Could not load metadata: {e}")
-        return {"schema": {}, "images": {}}
+        mtime = os.stat(METADATA_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    state = _meta_state
+    if mtime == state["mtime"]:
+        return state
+
+    with _meta_lock:
+        # Another thread may have reloaded while we waited for the lock
+        state = _meta_state
+        if mtime == state["mtime"]:
+            return state
+
+        if mtime is None:
+            state = _empty_meta_state()
+        else:
+            try:
+                metadata = orjson.loads(METADATA_FILE.read_bytes())
+
+                state = {
+                    "mtime": mtime,
+                    "data": metadata,
+                    "indexes": _build_indexes(metadata.get("images", {})),
+                    "stats": _build_stats(metadata.get("images", {})),
+                    "variants": _build_variants(metadata.get("images", {}))
+                }
+            except Exception as e:
+                # Keep serving the last good metadata, but record this mtime
+                # so a bad file is only parsed and reported once per change
+                print(f"Warning: Could not load metadata: {e}")
+                state = {**state, "mtime": mtime}
+
+        _meta_state = state
+        return state
+
+
+def _media_folder_exists() -> bool:
+    """Return whether the media folder exists, re-checking at most every MEDIA_CHECK_TTL seconds."""
+    global _media_check
+
+    checked_at, exists = _media_check
+    now = time.monotonic()
+    if now - checked_at >= MEDIA_CHECK_TTL:
+        exists = MEDIA_FOLDER.exists()
+        _media_check = (now, exists)
+
+    return exists
+
+
+def _get_image_index() -> Tuple[Tuple[str, Path], ...]:
+    """Return (name, path) pairs for all images in the media folder.
+
+    The listing is cached and only rebuilt when the folder's mtime changes,
+    which happens whenever a file is added, removed or renamed.
+    """
+    global _image_index, _image_paths, _index_mtime
+
+    try:
+        mtime = os.stat(MEDIA_FOLDER).st_mtime_ns
+        if mtime == _index_mtime:
+            return _image_index
+
+        with os.scandir(MEDIA_FOLDER) as it:
+            image_index = tuple(
+                (e.name, Path(e.path)) for e in it
+                if e.is_file(follow_symlinks=False)
+                and is_supported_image(e.name)
+            )
+    except FileNotFoundError:
+        # The folder existed at startup but has since been removed
+        raise HTTPException(status_code=500, detail="Media folder not found")
+
+    _image_paths = dict(image_index)
+    _image_index = image_index
+    _index_mtime = mtime
+    return _image_index
 
 
-def filter_images_by_metadata(
+def _matching_image_names(
+    state: Dict[str, Any],
     aircraft: Optional[str] = None,
     location: Optional[str] = None,
     time_of_day: Optional[str] = None,
     weather: Optional[str] = None,
     tags: Optional[str] = None
-) -> List[str]:
-    """Filter images based on metadata criteria."""
-    metadata = load_metadata()
-    images_metadata = metadata.get("images", {})
-
-    # Get all image files
-    all_images = [
-        f.name for f in MEDIA_FOLDER.iterdir()
-        if f.is_file() and f.suffix.lower() in SUPPORTED_FORMATS
-    ]
+) -> Optional[Set[str]]:
+    """Return names of images matching every filter, or None if nothing is filtered."""
+    metadata, indexes = state["data"], state["indexes"]
 
-    # If no metadata or no filters, return all images
-    if not images_metadata or not any([aircraft, location, time_of_day, weather, tags]):
-        return all_images
+    # If no metadata or no filters, every image matches
+    if not metadata.get("images") or not any([aircraft, location, time_of_day, weather, tags]):
+        return None
 
     # Parse tags parameter (comma-separated)
     tag_list = [t.strip() for t in tags.split(",")] if tags else []
 
-    # Filter images
-    filtered = []
-    for image_name in all_images:
-        image_meta = images_metadata.get(image_name, {})
+    criteria = [
+        (field, value)
+        for field, value in (
+            ("aircraft", aircraft),
+            ("location", location),
+            ("time_of_day", time_of_day),
+            ("weather", weather),
+        )
+        if value
+    ]
+    criteria.extend(("tags", tag) for tag in tag_list)
 
-        # Check each filter criterion
-        if aircraft and aircraft not in image_meta.get("aircraft", []):
-            continue
+    # Intersect smallest first so the working set only ever shrinks
+    matches = sorted(
+        (indexes.get(field, {}).get(value, _NO_MATCHES) for field, value in criteria),
+        key=len
+    )
+    return set(matches[0]).intersection(*matches[1:])
 
-        if location and image_meta.get("location") != location:
-            continue
 
-        if time_of_day and image_meta.get("time_of_day") != time_of_day:
-            continue
+def _pick_random_image(candidates: Optional[Set[str]] = None) -> Optional[Tuple[str, Path]]:
+    """Pick one (name, path) entry uniformly at random from the image index.
 
-        if weather and image_meta.get("weather") != weather:
-            continue
+    Only names in candidates are considered, unless candidates is None.
+    Filtered picks only look at the candidates, not the whole index.
+    """
+    image_index = _get_image_index()
 
-        if tag_list:
-            image_tags = image_meta.get("tags", [])
-            if not all(tag in image_tags for tag in tag_list):
-                continue
+    if candidates is None:
+        return _rng.choice(image_index) if image_index else None
 
-        filtered.append(image_name)
+    # Metadata may list images that are no longer on disk
+    image_paths = _image_paths
+    matches = [name for name in candidates if name in image_paths]
+    if not matches:
+        return None
 
-    return filtered
+    selected_image = _rng.choice(matches)
+    return selected_image, image_paths[selected_image]
 
 
 def get_random_image(
@@ -99,46 +325,84 @@ def get_random_image(
     tags: Optional[str] = None
 ) -> tuple[Path, Dict[str, Any]]:
     """Get a random image file from the media folder, optionally filtered by metadata."""
-    if not MEDIA_FOLDER.exists():
+    if not _media_ok:
         raise HTTPException(status_code=500, detail="Media folder not found")
 
-    # Get filtered image list
-    filtered_images = filter_images_by_metadata(aircraft, location, time_of_day, weather, tags)
+    state = _load_meta_state()
+    candidates = _matching_image_names(state, aircraft, location, time_of_day, weather, tags)
+
+    # Select a random image among those matching the filters
+    selected = _pick_random_image(candidates)
 
-    if not filtered_images:
+    if selected is None:
         raise HTTPException(
             status_code=404,
             detail="No images found matching the specified criteria"
         )
 
-    # Select random image
-    selected_image = random.choice(filtered_images)
-    image_path = MEDIA_FOLDER / selected_image
+    selected_image, image_path = selected
 
-    # Get metadata for this image
-    metadata = load_metadata()
-    image_metadata = metadata.get("images", {}).get(selected_image, {})
+    # Get metadata for this image from the same snapshot used for filtering
+    image_metadata = state["data"].get("images", {}).get(selected_image, {})
 
     return image_path, image_metadata
 
 
-def resize_image(image: Image.Image, width: Optional[int], height: Optional[int]) -> Image.Image:
-    """Resize image to specified dimensions while maintaining aspect ratio if only one dimension is provided."""
-    if width is None and height is None:
-        return image
+def _cached_render(key: Tuple[Path, int, Optional[int], Optional[int]]) -> Optional[bytes]:
+    """Return cached JPEG bytes for (path, mtime_ns, width, height), or None on a miss.
 
-    original_width, original_height = image.size
+    Cheap enough to call on the event loop, so cache hits never queue behind
+    renders in _pil_pool.
+    """
+    with _render_cache_lock:
+        payload = _render_cache.get(key)
+        if payload is not None:
+            _render_cache.move_to_end(key)
+        return payload
 
-    if width and height:
-        return image.resize((width, height), Image.Resampling.LANCZOS)
-    elif width:
-        aspect_ratio = original_height / original_width
-        new_height = int(width * aspect_ratio)
-        return image.resize((width, new_height), Image.Resampling.LANCZOS)
-    else:
-        aspect_ratio = original_width / original_height
-        new_width = int(height * aspect_ratio)
-        return image.resize((new_width, height), Image.Resampling.LANCZOS)
+
+def _render_jpeg(path: Path, mtime_ns: int, width: Optional[int], height: Optional[int]) -> bytes:
+    """Render JPEG bytes for an image and store them in the render cache.
+
+    Runs in _pil_pool after a _cached_render miss. Results are cached per
+    (path, mtime_ns, width, height); mtime_ns is only part of the key so that
+    a modified file is rendered again. The cache holds at most
+    RENDER_CACHE_MAX_BYTES in total, so arbitrary width/height combinations
+    can't grow it without bound.
+    """
+    global _render_cache_bytes
+
+    payload = encode_jpeg(path, width, height)
+    if len(payload) > RENDER_CACHE_MAX_ENTRY_BYTES:
+        return payload
+
+    key = (path, mtime_ns, width, height)
+    with _render_cache_lock:
+        if key not in _render_cache:
+            _render_cache[key] = payload
+            _render_cache_bytes += len(payload)
+
+            while _render_cache_bytes > RENDER_CACHE_MAX_BYTES:
+                _, evicted = _render_cache.popitem(last=False)
+                _render_cache_bytes -= len(evicted)
+
+    return payload
+
+
+async def _get_jpeg(path: Path, width: Optional[int], height: Optional[int]) -> bytes:
+    """Return JPEG bytes for an image, rendering in _pil_pool only on a cache miss."""
+    key = (path, path.stat().st_mtime_ns, width, height)
+
+    payload = _cached_render(key)
+    if payload is None:
+        payload = await asyncio.get_running_loop().run_in_executor(_pil_pool, _render_jpeg, *key)
+
+    return payload
+
+
+def _find_variant(image_name: str, width: Optional[int], height: Optional[int]) -> Optional[Path]:
+    """Return the up-to-date pre-rendered variant for this exact size, if there is one."""
+    return _meta_state["variants"].get(image_name, {}).get(variant_key(width, height))
 
 
 def get_random_avatar() -> Path:
@@ -146,15 +410,16 @@ def get_random_avatar() -> Path:
     if not AVATARS_FOLDER.exists():
         raise HTTPException(status_code=500, detail="Avatars folder not found")
 
-    avatar_files = [
-        f for f in AVATARS_FOLDER.iterdir()
-        if f.is_file() and f.suffix.lower() in SUPPORTED_FORMATS
-    ]
+    with os.scandir(AVATARS_FOLDER) as it:
+        avatar_files = [
+            Path(e.path) for e in it
+            if e.is_file(follow_symlinks=False) and is_supported_image(e.name)
+        ]
 
     if not avatar_files:
         raise HTTPException(status_code=404, detail="No avatars found in avatars folder")
 
-    return random.choice(avatar_files)
+    return _rng.choice(avatar_files)
 
 
 @app.get("/")
@@ -191,6 +456,7 @@ async def get_random_screenshot(
     Optionally filter by metadata (aircraft, location, time_of_day, weather, tags).
     Optionally resize the image by providing width and/or height parameters.
     If only one dimension is provided, aspect ratio is maintained.
+    Without resizing, JPEG, PNG and WebP files are returned unmodified.
     """
     image_path, image_metadata = get_random_image(
         aircraft=aircraft,
@@ -200,40 +466,41 @@ async def get_random_screenshot(
         tags=tags
     )
 
+    # Build response headers with metadata
+    headers = {"X-Image-Source": image_path.name}
+    if image_metadata:
+        if image_metadata.get("aircraft"):
+            headers["X-Image-Aircraft"] = ",".join(image_metadata["aircraft"])
+        if image_metadata.get("location"):
+            headers["X-Image-Location"] = image_metadata["location"]
+        if image_metadata.get("time_of_day"):
+            headers["X-Image-TimeOfDay"] = image_metadata["time_of_day"]
+        if image_metadata.get("weather"):
+            headers["X-Image-Weather"] = image_metadata["weather"]
+        if image_metadata.get("tags"):
+            headers["X-Image-Tags"] = ",".join(image_metadata["tags"])
+
+    # Without resizing, formats browsers display natively are sent as-is
+    media_type = PASSTHROUGH_MEDIA_TYPES.get(image_path.suffix.lower())
+    if not width and not height and media_type:
+        return FileResponse(image_path, media_type=media_type, headers=headers)
+
+    # Sizes pre-rendered by generate_metadata.py are sent from disk
+    variant_path = _find_variant(image_path.name, width, height)
+    if variant_path is not None:
+        return FileResponse(variant_path, media_type="image/jpeg", headers=headers)
+
     try:
-        with Image.open(image_path) as img:
-            if img.mode in ("RGBA", "LA", "P"):
-                img = img.convert("RGB")
-
-            if width or height:
-                img = resize_image(img, width, height)
-
-            img_byte_arr = BytesIO()
-            img.save(img_byte_arr, format="JPEG", quality=85)
-            img_byte_arr.seek(0)
-
-            # Build response headers with metadata
-            headers = {"X-Image-Source": image_path.name}
-            if image_metadata:
-                if image_metadata.get("aircraft"):
-                    headers["X-Image-Aircraft"] = ",".join(image_metadata["aircraft"])
-                if image_metadata.get("location"):
-                    headers["X-Image-Location"] = image_metadata["location"]
-                if image_metadata.get("time_of_day"):
-                    headers["X-Image-TimeOfDay"] = image_metadata["time_of_day"]
-                if image_metadata.get("weather"):
-                    headers["X-Image-Weather"] = image_metadata["weather"]
-                if image_metadata.get("tags"):
-                    headers["X-Image-Tags"] = ",".join(image_metadata["tags"])
-
-            return StreamingResponse(
-                img_byte_arr,
-                media_type="image/jpeg",
-                headers=headers
-            )
+        payload = await _get_jpeg(image_path, width, height)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing image: {str(e)}")
 
+    return Response(
+        content=payload,
+        media_type="image/jpeg",
+        headers=headers
+    )
+
 
 @app.get("/avatar")
 async def get_random_avatar_endpoint(
@@ -249,25 +516,16 @@ async def get_random_avatar_endpoint(
     avatar_path = get_random_avatar()
 
     try:
-        with Image.open(avatar_path) as img:
-            if img.mode in ("RGBA", "LA", "P"):
-                img = img.convert("RGB")
-
-            if width or height:
-                img = resize_image(img, width, height)
-
-            img_byte_arr = BytesIO()
-            img.save(img_byte_arr, format="JPEG", quality=85)
-            img_byte_arr.seek(0)
-
-            return StreamingResponse(
-                img_byte_arr,
-                media_type="image/jpeg",
-                headers={"X-Avatar-Source": avatar_path.name}
-            )
+        payload = await _get_jpeg(avatar_path, width, height)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing avatar: {str(e)}")
 
+    return Response(
+        content=payload,
+        media_type="image/jpeg",
+        headers={"X-Avatar-Source": avatar_path.name}
+    )
+
 
 @app.get("/tags")
 async def list_tags():
@@ -276,51 +534,21 @@ async def list_tags():
 
     Returns the schema of available tag values and counts of tagged images.
     """
-    metadata = load_metadata()
-    schema = metadata.get("schema", {})
-    images_metadata = metadata.get("images", {})
+    state = _load_meta_state()
+
+    # A media folder removed after startup counts as no images
+    try:
+        total_images = len(_get_image_index()) if _media_ok else 0
+    except HTTPException:
+        total_images = 0
 
-    # Count images with each tag
     stats = {
-        "total_images": len([
-            f for f in MEDIA_FOLDER.iterdir()
-            if f.is_file() and f.suffix.lower() in SUPPORTED_FORMATS
-        ]) if MEDIA_FOLDER.exists() else 0,
-        "tagged_images": len(images_metadata),
-        "aircraft_counts": {},
-        "location_counts": {},
-        "time_of_day_counts": {},
-        "weather_counts": {},
-        "tag_counts": {}
+        "total_images": total_images,
+        **state["stats"]
     }
 
-    # Count occurrences
-    for image_meta in images_metadata.values():
-        # Aircraft
-        for aircraft in image_meta.get("aircraft", []):
-            stats["aircraft_counts"][aircraft] = stats["aircraft_counts"].get(aircraft, 0) + 1
-
-        # Location
-        location = image_meta.get("location")
-        if location:
-            stats["location_counts"][location] = stats["location_counts"].get(location, 0) + 1
-
-        # Time of day
-        time_of_day = image_meta.get("time_of_day")
-        if time_of_day:
-            stats["time_of_day_counts"][time_of_day] = stats["time_of_day_counts"].get(time_of_day, 0) + 1
-
-        # Weather
-        weather = image_meta.get("weather")
-        if weather:
-            stats["weather_counts"][weather] = stats["weather_counts"].get(weather, 0) + 1
-
-        # Tags
-        for tag in image_meta.get("tags", []):
-            stats["tag_counts"][tag] = stats["tag_counts"].get(tag, 0) + 1
-
     return {
-        "schema": schema,
+        "schema": state["data"].get("schema", {}),
         "statistics": stats
     }
 
@@ -328,13 +556,22 @@ async def list_tags():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    image_count = len([
-        f for f in MEDIA_FOLDER.iterdir()
-        if f.is_file() and f.suffix.lower() in SUPPORTED_FORMATS
-    ]) if MEDIA_FOLDER.exists() else 0
+    media_folder_exists = _media_folder_exists()
+
+    # Report the cached index as-is; it is refreshed by image requests, so
+    # probes only scan the folder when nothing has warmed the cache yet.
+    if not media_folder_exists:
+        image_count = 0
+    elif _index_mtime is None:
+        try:
+            image_count = len(_get_image_index())
+        except HTTPException:
+            media_folder_exists, image_count = False, 0
+    else:
+        image_count = len(_image_index)
 
     return {
         "status": "healthy",
-        "media_folder_exists": MEDIA_FOLDER.exists(),
+        "media_folder_exists": media_folder_exists,
         "image_count": image_count
     }